@@ -15,7 +15,9 @@ from loguru import logger
 # Load environment variables from .env file if it exists
 load_dotenv()
 
-DEV_MODE = os.getenv("DEV_MODE", True)
+# Development mode limits `pull` to a single page. Environment values are
+# strings, so parse them explicitly: production deployments set DEV_MODE=0.
+DEV_MODE = os.getenv("DEV_MODE", "1").strip().lower() in ("1", "true", "yes")
 
 # Paths
 PROJ_ROOT = Path(__file__).resolve().parents[1]
@@ -43,6 +45,9 @@ FETCHER_BASE_PARAMS = {
     "sort": "created",
     "direction": "ASC",
 }
+# Concurrent requests in flight and requests per second allowed by `pull`
+FETCHER_MAX_CONCURRENCY = 8
+FETCHER_RATE_LIMIT = 1.0
 
 # If tqdm is installed, configure loguru with tqdm.write
 # https://github.com/Delgan/loguru/issues/135
@@ -50,6 +55,11 @@ try:
     from tqdm import tqdm
 
     logger.remove(0)
-    logger.add(lambda msg: tqdm.write(msg, end=""), colorize=True)
+    # Per-page and per-chunk debug messages are hidden unless LOGURU_LEVEL=DEBUG
+    logger.add(
+        lambda msg: tqdm.write(msg, end=""),
+        colorize=True,
+        level=os.getenv("LOGURU_LEVEL", "INFO"),
+    )
 except ModuleNotFoundError:
     pass
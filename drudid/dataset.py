@@ -3,18 +3,27 @@ Dataset management module for the drudid project.
 
 This module provides CLI commands for fetching, merging, and converting
 Drupal.org API data. It handles paginated data retrieval, JSON processing,
-and conversion to various formats like CSV and Parquet.
+and conversion to the Parquet format.
 """
 
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 import gc
-import glob
-import time
+from itertools import chain, islice
+import math
+import mmap
+import os
+from pathlib import Path
 
 import httpx
 from loguru import logger
 import orjson
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 import typer
 
 from drudid.config import (
@@ -24,40 +33,79 @@ from drudid.config import (
     INTERIM_DATA_DIR,
     RAW_DATA_DIR,
 )
-from drudid.fetcher import Fetcher
+from drudid.fetcher import AsyncFetcher, Fetcher
 
 app = typer.Typer()
 
+# Files smaller than this are read in one go, bigger ones are memory-mapped
+MMAP_MIN_SIZE = 16 * 1024
 
-def load_large_csv_to_pd(input_file: str, chunk_size: int = typer.Option(1000)) -> pd.DataFrame:
-    """
-    Load a large CSV file into a pandas DataFrame using chunked reading.
 
-    This function reads a CSV file in chunks to manage memory usage,
-    ensuring all data is converted to strings to handle mixed data types.
+async def _pull_page(fetcher: AsyncFetcher, i: int, params: dict, dataset_dir: Path, force: bool):
+    """
+    Fetch a single page and save it as a JSON file.
 
     Args:
-        input_file: Path to the input CSV file
-        chunk_size: Number of rows to read per chunk for memory management
+        fetcher: Shared asynchronous fetcher
+        i: Page number to fetch
+        params: Base query parameters of the resource
+        dataset_dir: Directory where JSON files are saved
+        force: Refetch even if the file already exists
 
     Returns:
-        pd.DataFrame: Combined DataFrame with all data as strings
+        bool: Whether the page was downloaded and saved
     """
-    chunk_list = []
-    for chunk in pd.read_csv(
-        input_file,
-        low_memory=False,
-        chunksize=chunk_size,
-        on_bad_lines="skip",
-        dtype=str,  # Force all columns to be read as strings
-    ):
-        # Convert everything to string, handling all edge cases
-        for col in chunk.columns:
-            chunk[col] = chunk[col].apply(lambda x: str(x) if pd.notna(x) else "")
+    file_path = dataset_dir / f"page_{i}.json"
+    # Hot-path messages use loguru's deferred formatting, skipped below DEBUG
+    if file_path.exists() and not force:
+        logger.debug("Skipping page {} (use --force to overwrite).", i)
+        return False
+
+    # Let the server answer 304 if the page did not change since last fetch
+    etag_path = dataset_dir / f"page_{i}.etag"
+    headers = {}
+    if file_path.exists() and etag_path.exists():
+        headers["If-None-Match"] = etag_path.read_text().strip()
+
+    response = await fetcher.fetch_data({**params, "page": str(i)}, headers=headers)
+    if not isinstance(response, httpx.Response):
+        return False
+
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        logger.debug("Page {} unchanged, keeping {}", i, file_path)
+        return False
 
-        chunk_list.append(chunk)
+    await asyncio.to_thread(file_path.write_bytes, orjson.dumps(response.json()))
+    logger.debug("Page {} saved to {}", i, file_path)
 
-    return pd.concat(chunk_list, ignore_index=True)
+    etag = response.headers.get("etag")
+    if etag:
+        await asyncio.to_thread(etag_path.write_text, etag)
+    elif etag_path.exists():
+        etag_path.unlink()
+
+    return True
+
+
+async def _pull_pages(pages: range, params: dict, dataset_dir: Path, force: bool) -> int:
+    """
+    Fetch pages concurrently over a single HTTP/2 client.
+
+    Args:
+        pages: Page numbers to fetch
+        params: Base query parameters of the resource
+        dataset_dir: Directory where JSON files are saved
+        force: Refetch even if the file already exists
+
+    Returns:
+        int: Number of pages downloaded and saved
+    """
+    async with AsyncFetcher() as fetcher:
+        saved = await tqdm_asyncio.gather(
+            *(_pull_page(fetcher, i, params, dataset_dir, force) for i in pages),
+            total=len(pages),
+        )
+    return sum(saved)
 
 
 @app.command()
@@ -69,12 +117,15 @@ def pull(
     """
     Source external data from Drupal.org API.
 
-    This function save paginated results as JSON files locally.
+    This function save paginated results as JSON files locally. Pages
+    are requested concurrently, within the configured rate limit. When
+    refetching, pages unchanged since their last download (same ETag)
+    are not downloaded again.
     """
-    params = FETCHER_BASE_PARAMS
+    # Work on a copy so the module-level defaults are never mutated
+    params = {**FETCHER_BASE_PARAMS}
     logger.info(f"Retrieving data from {FETCHER_BASE_URL}")
 
-    fetcher = Fetcher()
     dataset_dir = RAW_DATA_DIR
     dataset_dir.mkdir(parents=True, exist_ok=True)
 
@@ -87,27 +138,156 @@ def pull(
         if DEV_MODE:
             end_page = start_page + 1
         else:
-            end_page = fetcher.get_total_pages(params)
+            with Fetcher() as fetcher:
+                end_page = fetcher.get_total_pages(params)
 
     total_pages = end_page - start_page
     logger.info(f"Total {total_pages} pages to process")
 
-    for i in tqdm(range(start_page, end_page), total=total_pages):
-        file_path = dataset_dir / f"page_{i}.json"
-        if file_path.exists() and not force:
-            logger.info(f"Skipping page {i} (use --force to overwrite).")
-            continue
+    saved = asyncio.run(_pull_pages(range(start_page, end_page), params, dataset_dir, force))
+    logger.success(f"{saved} of {total_pages} pages saved to {dataset_dir}")
+
+
+def _iter_json_files(directory: Path) -> Iterator[str]:
+    """
+    Lazily yield the paths of the JSON files found in a directory.
+
+    Relies on os.scandir so file types come from the directory entries
+    instead of an extra stat call per file.
+
+    Args:
+        directory: Directory to scan
+
+    Yields:
+        str: Path of each JSON file
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.path
+
+
+def _load_one(file: str) -> list | None:
+    """
+    Read a single JSON page and extract its list of items.
+
+    Args:
+        file: Path to the JSON file
+
+    Returns:
+        list | None: Items of the page (non-object entries are skipped),
+            or None if the file is unusable
+    """
+    try:
+        with open(file, "rb") as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                items = orjson.loads(f.read())
+            else:
+                # Parse straight from the page cache instead of copying into a bytes object
+                with (
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+                    memoryview(mm) as view,
+                ):
+                    items = orjson.loads(view)
+
+        if not isinstance(items, dict) or not isinstance(items.get("list"), list):
+            logger.warning(f"Unexpected JSON structure in {file}")
+            return None
+
+        entries = [item for item in items["list"] if isinstance(item, dict)]
+        skipped = len(items["list"]) - len(entries)
+        if skipped:
+            logger.warning(f"Skipping {skipped} malformed items in {file}")
+        return entries
+    except Exception as e:
+        logger.error(f"Error processing {file}: {e}")
+        return None
+
+
+def _normalize_item(item: dict) -> dict:
+    """
+    Serialize the values of a Drupal.org API item to strings.
+
+    Drupal returns empty fields as `[]` and filled ones as objects, and the
+    same field may come back as a number on one page and a string on the
+    next; such values cannot share a single Arrow column type. Strings and
+    nulls are kept as-is, any other value is encoded as JSON text.
+
+    Args:
+        item: A single entry of the API `list` payload
+
+    Returns:
+        dict: The item with every non-null value as a string
+    """
+    return {
+        key: value if value is None or isinstance(value, str) else orjson.dumps(value).decode()
+        for key, value in item.items()
+    }
+
+
+def _extend_schema(items: list, schema: pa.Schema | None = None) -> pa.Schema:
+    """
+    Add the keys first seen in a chunk to the schema of the merged dataset.
+
+    Normalized values are strings or nulls, so no type inference is needed:
+    every column is a string. Known columns keep their position and new
+    keys are appended in order of first appearance.
+
+    Args:
+        items: Normalized items of the current chunk
+        schema: Schema built from the previous chunks, if any
+
+    Returns:
+        pa.Schema: The given schema when the chunk brings no new key,
+            otherwise a schema extended with the new keys
+    """
+    known = set(schema.names) if schema is not None else set()
+    new_keys = [key for key in dict.fromkeys(chain.from_iterable(items)) if key not in known]
+    if not new_keys:
+        return schema
+
+    new_schema = pa.schema([(key, pa.string()) for key in new_keys])
+    return new_schema if schema is None else pa.unify_schemas([schema, new_schema])
+
+
+def _build_chunk(
+    files: list, part_file: Path, schema: pa.Schema | None = None
+) -> tuple[int, pa.Schema | None]:
+    """
+    Parse a chunk of JSON pages and write it as a Feather part.
+
+    This runs in a worker process, so the table never travels back to the
+    main process: only its row count and schema are returned.
+
+    Args:
+        files: Paths of the JSON files of the chunk
+        part_file: Path of the Feather part to write
+        schema: Schema built from the previous chunks, if any
 
-        params["page"] = str(i)
+    Returns:
+        tuple[int, pa.Schema | None]: Number of rows and schema of the part,
+            or (0, None) if the chunk has no items
+    """
+    all_items = []
+    for file in files:
+        items = _load_one(file)
+        if items:
+            all_items.extend(_normalize_item(item) for item in items)
 
-        # Sleep to avoid hitting the rate limit too quickly.
-        time.sleep(1)
+    if not all_items:
+        return 0, None
 
-        response = fetcher.fetch_data(params)
-        if isinstance(response, httpx.Response):
-            with open(file_path, "wb") as f:
-                f.write(orjson.dumps(response.json()))
-                logger.success(f"Page {i} saved to {file_path}")
+    # The schema is reused as long as no new key shows up, so
+    # columns are built without type inference
+    schema = _extend_schema(all_items, schema)
+    table = pa.Table.from_pylist(all_items, schema=schema)
+
+    # A Feather file cannot gain columns once written, so each chunk
+    # gets its own part (Arrow IPC file with lz4-compressed buffers)
+    options = pa.ipc.IpcWriteOptions(compression="lz4")
+    with pa.ipc.new_file(part_file, schema, options=options) as writer:
+        writer.write_table(table)
+    return table.num_rows, schema
 
 
 @app.command()
@@ -115,91 +295,82 @@ def merge(
     chunk_size: int = typer.Option(1000, help="Number of files to process at once"),
 ):
     """
-    Merge multiple JSON files into a single CSV file.
+    Merge multiple JSON files into a Feather dataset.
 
     This function processes JSON files from the raw data directory,
-    extracts data from each file, and combines them into a single
-    CSV file for further processing. Files are processed in chunks
-    to manage memory usage.
+    extracts data from each file, and writes them as Feather (Arrow IPC)
+    parts, one per chunk, for further processing. Files are processed in
+    chunks to manage memory usage, spread over one worker process per
+    CPU core.
 
     Args:
-        chunk_size: Number of files to process simultaneously
+        chunk_size: Number of files handled by a worker at once
     """
     logger.info(f"Merging dataset (chunk size: {chunk_size})")
 
-    files = glob.glob(str(RAW_DATA_DIR / "*.json"))
-    total_files = len(files)
+    # Count first for progress reporting, then stream file names chunk by chunk
+    total_files = sum(1 for _ in _iter_json_files(RAW_DATA_DIR))
     logger.info(f"Found {total_files} files to merge")
 
-    if not files:
+    if not total_files:
         logger.warning("No files found to merge")
         return
 
-    output_file = INTERIM_DATA_DIR / "merged.csv"
-    first_chunk = True
-    total_rows = 0
-
-    # Process files in chunks to manage memory
-    for chunk_start in tqdm(range(0, total_files, chunk_size), desc="Processing chunks"):
-        chunk_files = files[chunk_start : chunk_start + chunk_size]
-        chunk_dataframes = []
-
-        # Process current chunk
-        for file in chunk_files:
-            try:
-                with open(file, "rb") as f:
-                    items = orjson.loads(f.read())
-                    if "list" in items:
-                        items = items["list"]
-                    else:
-                        logger.warning(f"Unexpected JSON structure in {file}")
-                        continue
-
-                    if items:
-                        df = pd.DataFrame(items)
-                        chunk_dataframes.append(df)
+    output_dir = INTERIM_DATA_DIR / "merged"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Parts left by a previous run would otherwise be read back by convert
+    for part in output_dir.glob("part_*.feather"):
+        part.unlink()
 
-            except Exception as e:
-                logger.error(f"Error processing {file}: {e}")
-                continue
+    schema = None
+    total_rows = 0
 
-        # Process current chunk if we have data
-        if chunk_dataframes:
-            chunk_df = pd.concat(chunk_dataframes, ignore_index=True)
-            total_rows += len(chunk_df)
+    files = _iter_json_files(RAW_DATA_DIR)
+    chunks = iter(lambda: list(islice(files, chunk_size)), [])
+    max_workers = os.cpu_count() or 1
+    pending = deque()
+    progress = tqdm(total=math.ceil(total_files / chunk_size), desc="Processing chunks")
 
-            # Write to CSV (append mode after first chunk)
-            if first_chunk:
-                chunk_df.to_csv(output_file, index=False, mode="w")
-                first_chunk = False
-                logger.info(f"Created output file with {len(chunk_df)} rows")
-            else:
-                chunk_df.to_csv(output_file, index=False, mode="a", header=False)
-                logger.info(f"Appended {len(chunk_df)} rows (total: {total_rows})")
-
-            # Clear memory
-            del chunk_df
-            del chunk_dataframes
+    try:
+        # Chunk data is freed by reference counting, so in the workers, which
+        # hold the parsed dicts, the cyclic garbage collector would only slow
+        # parsing down by rescanning millions of them
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=gc.disable) as executor:
+            # A trailing None flushes the chunks still in flight
+            for chunk_index, chunk_files in enumerate(chain(chunks, [None])):
+                if chunk_files is not None:
+                    part_file = output_dir / f"part_{chunk_index:05d}.feather"
+                    pending.append(executor.submit(_build_chunk, chunk_files, part_file, schema))
+
+                # Keep a bounded number of chunks in flight
+                while pending and (chunk_files is None or len(pending) >= 2 * max_workers):
+                    num_rows, part_schema = pending.popleft().result()
+                    progress.update()
+                    if part_schema is None:
+                        continue
 
-        # Force garbage collection after each chunk
-        gc.collect()
+                    # Chunks submitted from now on start from the keys known so far
+                    schema = (
+                        part_schema if schema is None else pa.unify_schemas([schema, part_schema])
+                    )
+                    total_rows += num_rows
+                    logger.debug("Merged {} rows (total: {})", num_rows, total_rows)
+    finally:
+        progress.close()
 
-    logger.success(f"Merged dataset saved to {output_file} with {total_rows} total rows")
+    logger.success(f"Merged dataset saved to {output_dir} with {total_rows} total rows")
 
 
 @app.command()
-def convert(
-    chunk_size: int = typer.Option(1000, help="Number of rows per chunk for processing"),
-):
+def convert():
     """
-    Convert merged CSV dataset to Parquet format.
-
-    This function loads the merged CSV file created by the merge command
-    and converts it to Parquet format for more efficient storage and
-    querying. All data is normalized to string format before conversion.
+    Convert the merged Feather dataset to Parquet format.
 
-    Args:
-        chunk_size: Number of rows to process per chunk during CSV loading
+    This function loads the Feather parts created by the merge command,
+    combines them under a single schema (columns missing from a part are
+    filled with nulls) and converts them to Parquet format in the raw
+    data directory for more efficient storage and querying. Column types
+    are kept as produced by merge, with missing values stored as nulls.
     """
     input_dataset_dir = INTERIM_DATA_DIR
     input_dataset_dir.mkdir(parents=True, exist_ok=True)
@@ -208,34 +379,43 @@ def convert(
 
     try:
         logger.info("Converting dataset to Parquet format")
-        df = load_large_csv_to_pd(str(input_dataset_dir / "merged.csv"), chunk_size=chunk_size)
-        logger.info(f"Successfully loaded {len(df)} rows")
-
-        # Safety check.
-        logger.debug("Converting all columns to string")
-        for col in df.columns:
-            try:
-                df[col] = df[col].astype(str)
-            except Exception as e:
-                logger.warning(f"Issue converting column '{col}': {e}")
-                df[col] = df[col].apply(lambda x: str(x) if x is not None else "")
+        parts = sorted((input_dataset_dir / "merged").glob("part_*.feather"))
+        if not parts:
+            logger.warning("No merged dataset found, run merge first")
+            return
+
+        tables = []
+        for part in parts:
+            # Arrow IPC needs no parsing: buffers are mapped and only lz4-decompressed
+            with pa.memory_map(str(part)) as source:
+                tables.append(pa.ipc.open_file(source).read_all())
+
+        # Later parts may hold columns first seen after the earlier ones were
+        # written: the part schemas are unified and missing columns null-filled
+        table = pa.concat_tables(tables, promote_options="default")
+        del tables
+        logger.info(f"Successfully loaded {table.num_rows} rows")
 
         # Save to parquet file.
         try:
-            df.to_parquet(
+            pq.write_table(
+                table,
                 output_dataset_dir / "merged.parquet",
-                index=False,
-                engine="pyarrow",
-                compression="snappy",
+                compression="zstd",
+                compression_level=3,
+                # Large row groups and dictionary pages suit the repetitive string columns
+                row_group_size=256_000,
+                use_dictionary=True,
+                data_page_size=1 << 20,
+                write_statistics=True,
             )
             logger.success("Dataset converted to parquet")
-        except (ImportError, ValueError, OSError) as parquet_error:
+        except (ImportError, ValueError, OSError, pa.ArrowNotImplementedError) as parquet_error:
             logger.error(f"Parquet conversion error: {parquet_error}")
-            # Try with different engine or settings
-            df.to_parquet(
+            # Try with different settings
+            pq.write_table(
+                table,
                 output_dataset_dir / "merged.parquet",
-                index=False,
-                engine="pyarrow",
                 compression=None,
                 use_deprecated_int96_timestamps=True,
             )
@@ -1,10 +1,12 @@
 """
 HTTP client for fetching data from Drupal.org API.
 
-This module provides a Fetcher class that handles HTTP requests to the
-Drupal.org API with HTTP/2 support, rate limiting, and error handling.
+This module provides Fetcher and AsyncFetcher classes that handle HTTP
+requests to the Drupal.org API with HTTP/2 support, rate limiting, and
+error handling.
 """
 
+import asyncio
 import time
 from typing import Dict, Optional
 from urllib.parse import urljoin
@@ -12,13 +14,47 @@ from urllib.parse import urljoin
 import httpx
 from loguru import logger
 
-from .config import FETCHER_BASE_URL, FETCHER_HEADERS
+from .config import (
+    FETCHER_BASE_URL,
+    FETCHER_HEADERS,
+    FETCHER_MAX_CONCURRENCY,
+    FETCHER_RATE_LIMIT,
+)
 
 
-class Fetcher:
+class _BaseFetcher:
+    """
+    Shared settings and error reporting for the Drupal.org fetchers.
+    """
+
+    def __init__(self, base_url: str, timeout: int, sleep: int):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.sleep = sleep
+        self.logger = logger
+
+    def _log_error(self, url: str, e: httpx.HTTPError) -> Optional[int]:
+        """
+        Log a failed request.
+        Returns the HTTP status code of the response, if any.
+        """
+        status_code = getattr(getattr(e, "response", None), "status_code", None)
+        exc_type = type(e).__name__
+        if status_code == 429:
+            self.logger.warning(f"Rate limit exceeded: {url} | {exc_type}: {e}")
+            self.logger.warning(f"Sleeping for {self.sleep} seconds")
+        elif status_code == 503:
+            self.logger.warning(f"Service unavailable: {url} | {exc_type}: {e}")
+        else:
+            self.logger.error(f"Request failed: {url} | {exc_type}: {e}")
+        return status_code
+
+
+class Fetcher(_BaseFetcher):
     """
     Fetcher for Drupal.org data using HTTPX with HTTP/2 support.
-    Optimized for single-threaded, fast sequential requests.
+    Optimized for single-threaded, fast sequential requests: connections
+    are pooled and reused until the fetcher is closed.
     """
 
     def __init__(
@@ -28,17 +64,29 @@ class Fetcher:
         headers: Optional[Dict] = None,
         timeout: int = 30,
         sleep: int = 10,  # Retry-After header from d.o = 10sec
+        transport: Optional[httpx.BaseTransport] = None,
     ):
-        self.base_url = base_url.rstrip("/")
-        self.timeout = timeout
-        self.sleep = sleep
+        super().__init__(base_url, timeout, sleep)
         self.client = httpx.Client(
             http2=True,
             timeout=timeout,
             headers={**FETCHER_HEADERS, **(headers or {})},
             cookies=cookies or {},
+            limits=httpx.Limits(keepalive_expiry=60),
+            transport=transport,
         )
-        self.logger = logger
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the underlying HTTP client and its pooled connections.
+        """
+        self.client.close()
 
     def _make_request(
         self, endpoint: str, params: Optional[Dict] = None, method: str = "GET", **kwargs
@@ -50,20 +98,14 @@ class Fetcher:
         url = urljoin(f"{self.base_url}/", endpoint.lstrip("/"))
         try:
             response = self.client.request(method=method, url=url, params=params or {}, **kwargs)
-            response.raise_for_status()
+            # 304 answers a conditional request, it is not an error
+            if response.status_code != httpx.codes.NOT_MODIFIED:
+                response.raise_for_status()
             return response
         except httpx.HTTPError as e:
-            status_code = getattr(getattr(e, "response", None), "status_code", None)
-            exc_type = type(e).__name__
-            if status_code == 429:
-                self.logger.warning(f"Rate limit exceeded: {url} | {exc_type}: {e}")
-                self.logger.warning(f"Sleeping for {self.sleep} seconds")
+            if self._log_error(url, e) == 429:
                 # Sleep a bit to avoid hitting the rate limit too quickly
                 time.sleep(self.sleep)
-            elif status_code == 503:
-                self.logger.warning(f"Service unavailable: {url} | {exc_type}: {e}")
-            else:
-                self.logger.error(f"Request failed: {url} | {exc_type}: {e}")
             return None
 
     def get_total_pages(self, params: Optional[Dict] = None) -> int:
@@ -90,11 +132,116 @@ class Fetcher:
     def fetch_data(
         self,
         params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+    ) -> Optional[httpx.Response]:
+        """
+        Fetch data from a specific resource.
+        Extra headers (e.g. If-None-Match) are sent along with the request.
+        Returns a Response object or None if the request fails.
+        """
+        request_params = (params or {}).copy()
+        endpoint = request_params.pop("resource")
+        return self._make_request(endpoint, params=request_params, headers=headers)
+
+
+class RateLimiter:
+    """
+    Async limiter spacing out entries to at most `rate` per second.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def wait(self):
+        """
+        Wait until the next slot is available.
+        """
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+    def pause(self, seconds: float):
+        """
+        Push the next slot at least `seconds` into the future.
+        """
+        now = asyncio.get_running_loop().time()
+        self._next_slot = max(self._next_slot, now + seconds)
+
+
+class AsyncFetcher(_BaseFetcher):
+    """
+    Asynchronous fetcher for Drupal.org data using HTTPX with HTTP/2 support.
+    Requests are multiplexed over a shared connection, with bounded
+    concurrency and a requests-per-second rate limit.
+    """
+
+    def __init__(
+        self,
+        base_url: str = FETCHER_BASE_URL,
+        cookies: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: int = 30,
+        sleep: int = 10,  # Retry-After header from d.o = 10sec
+        max_concurrency: int = FETCHER_MAX_CONCURRENCY,
+        rate_limit: float = FETCHER_RATE_LIMIT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        super().__init__(base_url, timeout, sleep)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=timeout,
+            headers={**FETCHER_HEADERS, **(headers or {})},
+            cookies=cookies or {},
+            limits=httpx.Limits(max_connections=max_concurrency, keepalive_expiry=60),
+            transport=transport,
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = RateLimiter(rate_limit)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    async def _make_request(
+        self, endpoint: str, params: Optional[Dict] = None, method: str = "GET", **kwargs
+    ) -> Optional[httpx.Response]:
+        """
+        Make an HTTP request to the API, waiting for a free slot first.
+        Returns a Response object or None if the request fails.
+        """
+        url = urljoin(f"{self.base_url}/", endpoint.lstrip("/"))
+        async with self.semaphore:
+            await self.rate_limiter.wait()
+            try:
+                response = await self.client.request(
+                    method=method, url=url, params=params or {}, **kwargs
+                )
+                # 304 answers a conditional request, it is not an error
+                if response.status_code != httpx.codes.NOT_MODIFIED:
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                if self._log_error(url, e) == 429:
+                    # Delay every pending request, not only this one
+                    self.rate_limiter.pause(self.sleep)
+                return None
+
+    async def fetch_data(
+        self,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
     ) -> Optional[httpx.Response]:
         """
         Fetch data from a specific resource.
+        Extra headers (e.g. If-None-Match) are sent along with the request.
         Returns a Response object or None if the request fails.
         """
         request_params = (params or {}).copy()
         endpoint = request_params.pop("resource")
-        return self._make_request(endpoint, params=request_params)
+        return await self._make_request(endpoint, params=request_params, headers=headers)
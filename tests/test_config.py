@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def dev_mode(value):
+    # config is evaluated at import time, so read it from a fresh interpreter
+    result = subprocess.run(
+        [sys.executable, "-c", "from drudid.config import DEV_MODE; print(DEV_MODE)"],
+        env={**os.environ, "DEV_MODE": value},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("1", "True"), (" TRUE ", "True"), ("yes", "True"), ("0", "False"), ("False", "False")],
+)
+def test_dev_mode_parses_environment_value(value, expected):
+    assert dev_mode(value) == expected
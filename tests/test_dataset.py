@@ -0,0 +1,195 @@
+import asyncio
+
+import httpx
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from drudid import dataset
+from drudid.dataset import (
+    _extend_schema,
+    _iter_json_files,
+    _load_one,
+    _normalize_item,
+    _pull_page,
+)
+from drudid.fetcher import AsyncFetcher
+
+PARAMS = {"resource": "node.json", "type": "project_issue"}
+
+
+@pytest.fixture
+def raw_dir(tmp_path, monkeypatch):
+    raw_dir, interim_dir = tmp_path / "raw", tmp_path / "interim"
+    raw_dir.mkdir()
+    interim_dir.mkdir()
+    monkeypatch.setattr(dataset, "RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(dataset, "INTERIM_DATA_DIR", interim_dir)
+    return raw_dir
+
+
+def write_pages(directory, pages):
+    for i, items in enumerate(pages):
+        (directory / f"page_{i}.json").write_bytes(orjson.dumps({"list": items}))
+
+
+def pull_page(directory, handler, force=True):
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with AsyncFetcher(rate_limit=1000, transport=transport) as fetcher:
+            return await _pull_page(fetcher, 3, PARAMS, directory, force)
+
+    return asyncio.run(run())
+
+
+def test_pull_page_saves_page(tmp_path):
+    def handler(request):
+        assert request.url.params["page"] == "3"
+        assert request.url.params["type"] == "project_issue"
+        return httpx.Response(200, json={"list": [{"nid": "1"}]})
+
+    assert pull_page(tmp_path, handler)
+    assert orjson.loads((tmp_path / "page_3.json").read_bytes()) == {"list": [{"nid": "1"}]}
+
+
+def test_pull_page_saves_etag(tmp_path):
+    def handler(request):
+        assert "If-None-Match" not in request.headers
+        return httpx.Response(200, json={"list": []}, headers={"ETag": '"v1"'})
+
+    assert pull_page(tmp_path, handler)
+
+    assert (tmp_path / "page_3.etag").read_text() == '"v1"'
+
+
+def test_pull_page_keeps_file_on_not_modified(tmp_path):
+    (tmp_path / "page_3.json").write_bytes(b'{"list": []}')
+    (tmp_path / "page_3.etag").write_text('"v1"')
+
+    def handler(request):
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(304, headers={"ETag": '"v1"'})
+
+    assert not pull_page(tmp_path, handler)
+    assert (tmp_path / "page_3.json").read_bytes() == b'{"list": []}'
+    assert (tmp_path / "page_3.etag").read_text() == '"v1"'
+
+
+def test_pull_page_skips_existing_file_without_force(tmp_path):
+    (tmp_path / "page_3.json").write_bytes(b'{"list": []}')
+
+    def handler(request):
+        raise AssertionError("No request expected")
+
+    assert not pull_page(tmp_path, handler, force=False)
+    assert (tmp_path / "page_3.json").read_bytes() == b'{"list": []}'
+
+
+def test_iter_json_files_lists_json_files_only(tmp_path):
+    (tmp_path / "page_0.json").write_bytes(b"{}")
+    (tmp_path / "page_0.etag").write_text('"v1"')
+    (tmp_path / "page_1.json").write_bytes(b"{}")
+    (tmp_path / "nested.json").mkdir()
+
+    files = _iter_json_files(tmp_path)
+
+    assert not isinstance(files, list)
+    assert sorted(files) == [str(tmp_path / "page_0.json"), str(tmp_path / "page_1.json")]
+
+
+def test_load_one_skips_malformed_pages(tmp_path):
+    (tmp_path / "null.json").write_bytes(b"null")
+    (tmp_path / "nolist.json").write_bytes(b'{"nope": 1}')
+    (tmp_path / "mixed.json").write_bytes(b'{"list": [1, {"nid": "2"}, "x"]}')
+
+    assert _load_one(str(tmp_path / "null.json")) is None
+    assert _load_one(str(tmp_path / "nolist.json")) is None
+    assert _load_one(str(tmp_path / "mixed.json")) == [{"nid": "2"}]
+
+
+def test_load_one_reads_large_pages_through_mmap(tmp_path, monkeypatch):
+    items = [{"nid": str(nid), "title": "x" * 100} for nid in range(200)]
+    page = tmp_path / "page_0.json"
+    page.write_bytes(orjson.dumps({"list": items}))
+    assert page.stat().st_size >= dataset.MMAP_MIN_SIZE
+
+    mapped = []
+    real_mmap = dataset.mmap.mmap
+
+    def spy(*args, **kwargs):
+        mapped.append(args)
+        return real_mmap(*args, **kwargs)
+
+    monkeypatch.setattr(dataset.mmap, "mmap", spy)
+
+    assert _load_one(str(page)) == items
+    assert len(mapped) == 1
+
+
+def test_normalize_item_stringifies_values():
+    item = {"nid": 1, "title": "t", "body": [], "parent": {"id": "2"}, "closed": None}
+    assert _normalize_item(item) == {
+        "nid": "1",
+        "title": "t",
+        "body": "[]",
+        "parent": '{"id":"2"}',
+        "closed": None,
+    }
+
+
+def test_extend_schema_appends_new_keys_as_strings():
+    schema = _extend_schema([{"nid": "1", "title": None}, {"nid": "2"}])
+    assert schema == pa.schema([("nid", pa.string()), ("title", pa.string())])
+
+    assert _extend_schema([{"title": "t"}, {"nid": "3"}], schema) is schema
+
+    extended = _extend_schema([{"closed": "0", "nid": "4"}], schema)
+    assert extended.names == ["nid", "title", "closed"]
+    assert extended.field("closed").type == pa.string()
+
+
+def test_merge_and_convert_keep_mixed_type_rows(raw_dir):
+    write_pages(
+        raw_dir,
+        [
+            [
+                {"nid": 2 * i, "score": i, "body": [], "closed": None if i < 2 else True},
+                {"nid": str(2 * i + 1), "score": "n/a", "body": {"value": "x"}, "closed": None},
+            ]
+            for i in range(5)
+        ],
+    )
+
+    dataset.merge(chunk_size=2)
+    dataset.convert()
+
+    rows = {row["nid"]: row for row in pq.read_table(raw_dir / "merged.parquet").to_pylist()}
+    assert sorted(rows, key=int) == [str(nid) for nid in range(10)]
+    assert rows["2"]["score"] == "1"
+    assert rows["3"]["score"] == "n/a"
+    assert rows["2"]["body"] == "[]"
+    assert rows["3"]["body"] == '{"value":"x"}'
+    assert rows["8"]["closed"] == "true"
+
+
+def test_merge_and_convert_keep_columns_first_seen_in_later_chunks(raw_dir):
+    # Each page brings its own field, so whichever is merged last adds a column
+    write_pages(
+        raw_dir,
+        [
+            [{"nid": "0", "first_field": "a"}],
+            [{"nid": "1", "second_field": "b"}],
+            [{"nid": "2"}],
+        ],
+    )
+
+    dataset.merge(chunk_size=1)
+    dataset.convert()
+
+    rows = {row["nid"]: row for row in pq.read_table(raw_dir / "merged.parquet").to_pylist()}
+    assert rows == {
+        "0": {"nid": "0", "first_field": "a", "second_field": None},
+        "1": {"nid": "1", "first_field": None, "second_field": "b"},
+        "2": {"nid": "2", "first_field": None, "second_field": None},
+    }
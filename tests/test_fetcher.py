@@ -0,0 +1,61 @@
+import asyncio
+
+import httpx
+
+from drudid.fetcher import AsyncFetcher, Fetcher, RateLimiter
+
+
+def test_rate_limiter_spaces_calls():
+    async def run():
+        limiter = RateLimiter(rate=20)
+        loop = asyncio.get_running_loop()
+        times = []
+        for _ in range(4):
+            await limiter.wait()
+            times.append(loop.time())
+        return times
+
+    times = asyncio.run(run())
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+def test_rate_limiter_pause_delays_next_slot():
+    async def run():
+        limiter = RateLimiter(rate=1000)
+        loop = asyncio.get_running_loop()
+        await limiter.wait()
+        limiter.pause(0.1)
+        start = loop.time()
+        await limiter.wait()
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_fetcher_returns_not_modified_response():
+    def handler(request):
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(304, headers={"ETag": '"v1"'})
+
+    with Fetcher(transport=httpx.MockTransport(handler)) as fetcher:
+        response = fetcher.fetch_data({"resource": "node.json"}, headers={"If-None-Match": '"v1"'})
+
+    assert response is not None
+    assert response.status_code == 304
+
+
+def test_fetcher_context_closes_client():
+    with Fetcher(transport=httpx.MockTransport(lambda request: httpx.Response(200))) as fetcher:
+        pass
+
+    assert fetcher.client.is_closed
+
+
+def test_async_fetcher_returns_none_on_error():
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        async with AsyncFetcher(rate_limit=1000, transport=transport) as fetcher:
+            return await fetcher.fetch_data({"resource": "node.json", "page": "0"})
+
+    assert asyncio.run(run()) is None